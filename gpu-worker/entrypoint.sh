@@ -0,0 +1,13 @@
+#!/bin/sh
+set -e
+
+# Run the NVIDIA MPS control daemon so every CUDA client on this GPU shares
+# one context instead of time-slicing separate ones
+if command -v nvidia-cuda-mps-control >/dev/null 2>&1; then
+    export CUDA_MPS_ACTIVE_THREAD_PERCENTAGE="${CUDA_MPS_ACTIVE_THREAD_PERCENTAGE:-100}"
+    nvidia-cuda-mps-control -d
+fi
+
+# A single worker process keeps one copy of the models resident; concurrent
+# requests are batched inside the process
+exec python3 -m uvicorn main:app --host 0.0.0.0 --port 8001 --workers 1
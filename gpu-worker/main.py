@@ -1,26 +1,53 @@
 import os
+import io
+import re
 import json
 import asyncio
+import contextvars
+import functools
 import logging
+import time
+import threading
 from datetime import datetime
-from typing import List, Dict, Any
+from contextlib import AsyncExitStack
+from typing import List, Dict, Any, BinaryIO, Union
 import torch
+from torchvision.io import encode_jpeg
+from torchvision.transforms.v2 import functional as F
 import cv2
 import numpy as np
-from PIL import Image
 import face_recognition
-import whisper
+from faster_whisper import WhisperModel, BatchedInferencePipeline
 import spacy
+from thinc.api import set_gpu_allocator
 from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+from transformers.modeling_outputs import BaseModelOutput
 from fastapi import FastAPI, BackgroundTasks, HTTPException
 from fastapi.responses import JSONResponse
 import redis.asyncio as redis
-import boto3
+import aiohttp
+import aioboto3
+from boto3.s3.transfer import TransferConfig
 from cryptography.fernet import Fernet
 import psutil
-import subprocess
+import pynvml
 from prometheus_client import Counter, Histogram, Gauge, generate_latest
 
+try:
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+try:
+    import torch_tensorrt
+except ImportError:
+    torch_tensorrt = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,11 +56,182 @@ app = FastAPI(title="GPU Redaction Worker", version="1.0.0")
 
 # Metrics
 PROCESSED_REPORTS = Counter('processed_reports_total', 'Total processed reports')
-PROCESSING_TIME = Histogram('processing_time_seconds', 'Time spent processing reports')
+# Reports are processed in batches, so latency is measured per batch rather than per report
+BATCH_PROCESSING_TIME = Histogram('report_batch_processing_time_seconds', 'Time spent processing one batch of reports')
 GPU_UTILIZATION = Gauge('gpu_utilization_percent', 'GPU utilization percentage')
 FACES_REDACTED = Counter('faces_redacted_total', 'Total faces redacted')
 PII_REDACTED = Counter('pii_entities_redacted_total', 'Total PII entities redacted')
 
+# S3 storage for encrypted uploads and redacted outputs
+S3_BUCKET = os.getenv('S3_BUCKET', 'incident-reports-encrypted')
+S3_TRANSFER_CONFIG = TransferConfig(multipart_chunksize=8 * 1024 * 1024, use_threads=True)
+
+# Quality of the redacted JPEGs (OpenCV's default)
+JPEG_QUALITY = 95
+
+# Entity labels treated as PII
+OCR_PII_LABELS = ['PERSON', 'ORG', 'GPE', 'PHONE', 'EMAIL', 'SSN', 'CREDIT_CARD']
+AUDIO_PII_LABELS = ['PERSON', 'ORG', 'GPE', 'PHONE', 'EMAIL']
+
+# spaCy pipeline used for named entities. Unless SPACY_MODEL is set, the
+# transformer pipeline runs on GPU and the small CNN pipeline on CPU, where
+# the transformer would be far slower
+SPACY_MODEL = os.getenv('SPACY_MODEL')
+SPACY_GPU_MODEL = 'en_core_web_trf'
+SPACY_CPU_MODEL = 'en_core_web_sm'
+
+# Only doc.ents is used, so components feeding anything else stay off
+SPACY_DISABLED = ['tagger', 'parser', 'attribute_ruler', 'lemmatizer']
+
+# Rule-based PII that spaCy's English models never emit as entity labels
+PII_PATTERNS = {
+    'EMAIL': re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'),
+    'SSN': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
+    'CREDIT_CARD': re.compile(r'\b(?:\d[ -]?){12,15}\d\b'),
+    'PHONE': re.compile(r'(?:\+\d{1,3}[ .-]?)?(?:\(\d{3}\)[ .-]?|\b\d{3}[ .-])?\d{3}[ .-]\d{4}\b'),
+}
+
+# TensorRT face detector. The model must be a YOLOv8-face ONNX export with
+# EfficientNMS_TRT outputs (num_dets, det_boxes as x1, y1, x2, y2 in input
+# pixels) taking RGB input scaled to [0, 1], letterboxed with 114 padding.
+# The input needs a dynamic batch axis and is run at a static
+# FACE_INPUT_SIZE x FACE_INPUT_SIZE (640x640 by default).
+# Other detectors (e.g. RetinaFace, which expects mean-subtracted BGR) need
+# different preprocessing and are not supported.
+FACE_DETECTOR_ONNX = os.getenv('FACE_DETECTOR_ONNX', '/models/yolov8n-face-nms.onnx')
+FACE_DETECTOR_ENGINE = os.path.splitext(FACE_DETECTOR_ONNX)[0] + '.engine'
+FACE_INPUT_SIZE = int(os.getenv('FACE_INPUT_SIZE', '640'))
+FACE_MAX_BATCH = int(os.getenv('FACE_MAX_BATCH', '16'))
+
+# TrOCR encoder compiled with torch-tensorrt, cached so restarts skip the build
+OCR_ENCODER_ENGINE = os.getenv('OCR_ENCODER_ENGINE', '/models/trocr_encoder_fp16.ts')
+OCR_IMAGE_SIZE = 384
+OCR_MAX_BATCH = int(os.getenv('OCR_MAX_BATCH', '16'))
+OCR_BATCH_DELAY = float(os.getenv('OCR_BATCH_DELAY', '0.01'))
+
+# Seconds a GPU utilization reading is reused before NVML is queried again
+GPU_UTILIZATION_TTL = 1.0
+
+# Reports coalesced from the Redis queue into one processing batch
+JOB_QUEUE = 'gpu-worker-queue'
+JOB_MAX_BATCH = int(os.getenv('JOB_MAX_BATCH', '16'))
+JOB_BATCH_WINDOW = float(os.getenv('JOB_BATCH_WINDOW', '0.02'))
+
+# Audio segments decoded together by the batched Whisper pipeline
+WHISPER_BATCH_SIZE = int(os.getenv('WHISPER_BATCH_SIZE', '16'))
+
+async def run_in_thread(fn, *args):
+    """Run a blocking call in the default executor with the caller's context.
+    
+    Executor threads start with an empty contextvars context, which would drop
+    state such as the GPU ops that spacy.require_gpu() stores in thinc's
+    context_ops. This is asyncio.to_thread, which Python 3.8 lacks.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, fn, *args))
+
+
+class MicroBatcher:
+    """Coalesce concurrent submissions into batched calls of a blocking function.
+    
+    Items queued within ``max_delay`` seconds of each other are grouped, up to
+    ``max_batch`` at a time, and passed to ``batch_fn`` in an executor thread.
+    Each caller awaits the results of its own items.
+    """
+    
+    def __init__(self, batch_fn, max_batch: int, max_delay: float):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = None
+        self._task = None
+        self._batch = []  # items taken off the queue but not yet resolved
+        self._closed = False
+    
+    async def submit(self, items: list) -> list:
+        """Queue items and wait for their results, in order"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in items]
+        for item, future in zip(items, futures):
+            self._queue.put_nowait((item, future))
+        return list(await asyncio.gather(*futures))
+    
+    async def close(self):
+        """Stop the batching task and fail every item still waiting for a result"""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        
+        pending = self._batch
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher closed before the item was processed"))
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a first item, then collect more until the window closes
+            batch = self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await run_in_thread(self.batch_fn, [item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._batch = []
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._batch = []
+
+
+class EncoderHiddenStates(torch.nn.Module):
+    """Traceable wrapper returning only the encoder's last hidden state"""
+    
+    def __init__(self, encoder: torch.nn.Module):
+        super().__init__()
+        self.encoder = encoder
+    
+    def forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        return self.encoder(pixel_values=pixel_values, return_dict=False)[0]
+
+
+class CompiledEncoder(torch.nn.Module):
+    """Drop-in TrOCR encoder for generate() backed by a compiled module"""
+    main_input_name = 'pixel_values'
+    
+    def __init__(self, compiled: torch.nn.Module, config):
+        super().__init__()
+        self.compiled = compiled
+        self.config = config
+    
+    def forward(self, pixel_values: torch.Tensor = None, **kwargs) -> BaseModelOutput:
+        return BaseModelOutput(last_hidden_state=self.compiled(pixel_values))
+
+
 class GPURedactionWorker:
     def __init__(self):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
@@ -42,204 +240,740 @@ class GPURedactionWorker:
         # Load models
         self.load_models()
         
+        # NVML handle for reading GPU utilization in-process
+        self._nvml_handle = None
+        self._gpu_utilization = (0.0, None)  # (read time, value)
+        if self.device.type == 'cuda':
+            try:
+                pynvml.nvmlInit()
+                self._nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            except pynvml.NVMLError as e:
+                # Containers without the NVML library still serve requests,
+                # just without the utilization metric
+                logger.warning(f"NVML unavailable, GPU utilization will not be reported: {e}")
+        
+        # OCR requests from concurrent reports share generate calls
+        self.ocr_batcher = MicroBatcher(self.extract_and_redact_text_batch, OCR_MAX_BATCH, OCR_BATCH_DELAY)
+        
+        # Per-stage CUDA streams so H2D copies, OCR and face detection can overlap
+        if self.device.type == 'cuda':
+            self.copy_stream = torch.cuda.Stream()
+            self.ocr_stream = torch.cuda.Stream()
+            self.face_stream = torch.cuda.Stream()
+        
         # Initialize clients
         self.redis_client = None
-        self.s3_client = boto3.client('s3')
+        self.s3_client = None
+        self.http_session = None
+        self._exit_stack = AsyncExitStack()
         
     def load_models(self):
         """Load all ML models for redaction"""
         logger.info("Loading ML models...")
         
+        # SpaCy transformer NER on GPU - set up before any other CUDA work so
+        # cupy allocates through PyTorch's caching allocator instead of its own pool
+        if self.device.type == 'cuda':
+            set_gpu_allocator("pytorch")
+            spacy.require_gpu()
+            spacy_model = SPACY_MODEL or SPACY_GPU_MODEL
+        else:
+            spacy_model = SPACY_MODEL or SPACY_CPU_MODEL
+        self.nlp = spacy.load(spacy_model, disable=SPACY_DISABLED)
+        
+        # Rule-based PII patterns compiled into one Hyperscan database
+        self.pii_database = None
+        if hyperscan is not None:
+            self.pii_labels = list(PII_PATTERNS)
+            self.pii_database = hyperscan.Database()
+            self.pii_database.compile(
+                expressions=[PII_PATTERNS[label].pattern.encode() for label in self.pii_labels],
+                ids=list(range(len(self.pii_labels))),
+                elements=len(self.pii_labels),
+                flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(self.pii_labels)
+            )
+            # Scratch space must not be shared by concurrent scans
+            self._pii_scratch = threading.local()
+        
         # OCR Model (TrOCR)
         self.ocr_processor = TrOCRProcessor.from_pretrained('microsoft/trocr-base-printed')
         self.ocr_model = VisionEncoderDecoderModel.from_pretrained('microsoft/trocr-base-printed')
         self.ocr_model.to(self.device)
+        if self.device.type == 'cuda':
+            # FP16 halves memory traffic and runs on tensor cores
+            self.ocr_model.half()
+            self.load_ocr_encoder_engine()
         
-        # Whisper for audio transcription
-        self.whisper_model = whisper.load_model("base")
+        # Whisper (CTranslate2) for audio transcription, with batched decoding of VAD segments
+        compute_type = 'int8_float16' if self.device.type == 'cuda' else 'int8'
+        self.whisper_model = BatchedInferencePipeline(
+            model=WhisperModel("base", device=self.device.type, compute_type=compute_type)
+        )
         
-        # SpaCy for NER
-        self.nlp = spacy.load("en_core_web_sm")
+        # Batched GPU face detector
+        self.load_face_detector()
         
         logger.info("Models loaded successfully")
     
+    def load_ocr_encoder_engine(self):
+        """Replace the TrOCR encoder with a torch-tensorrt FP16 engine"""
+        if torch_tensorrt is None:
+            logger.info("torch-tensorrt unavailable, running the TrOCR encoder eagerly")
+            return
+        
+        # The engine only serves its own batch range on the GPU and TensorRT build it was made for
+        metadata = self._engine_metadata(min_batch=1, max_batch=OCR_MAX_BATCH, image_size=OCR_IMAGE_SIZE)
+        if self._cached_engine_matches(OCR_ENCODER_ENGINE, metadata):
+            compiled = torch.jit.load(OCR_ENCODER_ENGINE, map_location=self.device)
+        else:
+            logger.info("Compiling TrOCR encoder with torch-tensorrt...")
+            input_shape = (3, OCR_IMAGE_SIZE, OCR_IMAGE_SIZE)
+            example = torch.randn(1, *input_shape, device=self.device, dtype=torch.float16)
+            traced = torch.jit.trace(EncoderHiddenStates(self.ocr_model.encoder).eval(), example)
+            compiled = torch_tensorrt.compile(
+                traced,
+                ir='ts',
+                inputs=[torch_tensorrt.Input(
+                    min_shape=(1, *input_shape),
+                    opt_shape=(min(8, OCR_MAX_BATCH), *input_shape),
+                    max_shape=(OCR_MAX_BATCH, *input_shape),
+                    dtype=torch.float16
+                )],
+                enabled_precisions={torch.float16}
+            )
+            try:
+                os.makedirs(os.path.dirname(OCR_ENCODER_ENGINE), exist_ok=True)
+                torch.jit.save(compiled, OCR_ENCODER_ENGINE)
+                self._save_engine_metadata(OCR_ENCODER_ENGINE, metadata)
+            except (OSError, RuntimeError) as e:
+                # A read-only model mount only costs the cache, not the engine
+                logger.warning(f"Could not cache TrOCR encoder engine at {OCR_ENCODER_ENGINE}: {e}")
+        
+        self.ocr_model.encoder = CompiledEncoder(compiled, self.ocr_model.encoder.config)
+    
+    def _engine_metadata(self, **build_params) -> dict:
+        """Describe what a serialized TensorRT engine was built for"""
+        return {
+            'tensorrt': trt.__version__ if trt is not None else None,
+            'torch_tensorrt': torch_tensorrt.__version__ if torch_tensorrt is not None else None,
+            'gpu': torch.cuda.get_device_name(self.device),
+            'compute_capability': list(torch.cuda.get_device_capability(self.device)),
+            **build_params
+        }
+    
+    def _cached_engine_matches(self, path: str, metadata: dict) -> bool:
+        """Check that path holds an engine whose stored metadata equals metadata"""
+        try:
+            with open(f"{path}.json") as f:
+                return os.path.exists(path) and json.load(f) == metadata
+        except (OSError, ValueError):
+            return False
+    
+    def _save_engine_metadata(self, path: str, metadata: dict):
+        """Store the metadata of a freshly serialized engine next to it"""
+        with open(f"{path}.json", 'w') as f:
+            json.dump(metadata, f)
+    
+    def load_face_detector(self):
+        """Load the TensorRT face detector engine and its persistent buffers"""
+        self.face_engine = None
+        self.face_lock = threading.Lock()
+        if self.device.type != 'cuda' or trt is None:
+            logger.info("TensorRT face detector needs CUDA and tensorrt, falling back to face_recognition")
+            return
+        if not os.path.exists(FACE_DETECTOR_ONNX):
+            logger.warning(f"Face detector model {FACE_DETECTOR_ONNX} not found, falling back to "
+                           f"face_recognition on CPU; mount the model into /models to enable it")
+            return
+        
+        trt_logger = trt.Logger(trt.Logger.WARNING)
+        trt.init_libnvinfer_plugins(trt_logger, "")
+        
+        # Reuse the serialized engine unless the model or the build settings changed
+        metadata = self._engine_metadata(
+            max_batch=FACE_MAX_BATCH,
+            input_size=FACE_INPUT_SIZE,
+            onnx_size=os.path.getsize(FACE_DETECTOR_ONNX),
+            onnx_mtime=os.path.getmtime(FACE_DETECTOR_ONNX)
+        )
+        if self._cached_engine_matches(FACE_DETECTOR_ENGINE, metadata):
+            with open(FACE_DETECTOR_ENGINE, 'rb') as f:
+                serialized_engine = f.read()
+        else:
+            logger.info("Building TensorRT face detector engine...")
+            serialized_engine = self._build_face_engine(trt_logger)
+            try:
+                with open(FACE_DETECTOR_ENGINE, 'wb') as f:
+                    f.write(serialized_engine)
+                self._save_engine_metadata(FACE_DETECTOR_ENGINE, metadata)
+            except OSError as e:
+                # A read-only model mount only costs the cache, not the engine
+                logger.warning(f"Could not cache face detector engine at {FACE_DETECTOR_ENGINE}: {e}")
+        
+        engine = trt.Runtime(trt_logger).deserialize_cuda_engine(serialized_engine)
+        tensor_names = {engine.get_tensor_name(i) for i in range(engine.num_io_tensors)}
+        missing = {'num_dets', 'det_boxes'} - tensor_names
+        if missing:
+            raise RuntimeError(f"Face detector {FACE_DETECTOR_ONNX} has no EfficientNMS_TRT "
+                               f"outputs {sorted(missing)}; see FACE_DETECTOR_ONNX for the expected export")
+        
+        self.face_engine = engine
+        self.face_context = self.face_engine.create_execution_context()
+        
+        # Device buffers for every I/O tensor, sized for the largest batch. The
+        # engine's own shapes may be dynamic (-1), so the input is sized from the
+        # profile and the outputs from the context once that input shape is set.
+        # Their addresses never change, so they are bound to the context once
+        self.face_input_name = next(
+            name for name in tensor_names
+            if self.face_engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT
+        )
+        input_shape = (FACE_MAX_BATCH, 3, FACE_INPUT_SIZE, FACE_INPUT_SIZE)
+        self.face_context.set_input_shape(self.face_input_name, input_shape)
+        
+        dtypes = {trt.float32: torch.float32, trt.float16: torch.float16, trt.int32: torch.int32}
+        self.face_outputs = {}
+        for name in tensor_names:
+            if name == self.face_input_name:
+                shape = input_shape
+            else:
+                shape = tuple(self.face_context.get_tensor_shape(name))
+            buffer = torch.empty(shape, dtype=dtypes[self.face_engine.get_tensor_dtype(name)], device=self.device)
+            self.face_context.set_tensor_address(name, buffer.data_ptr())
+            if name == self.face_input_name:
+                self.face_input = buffer
+            else:
+                self.face_outputs[name] = buffer
+        
+        # Pinned host buffer and uint8 device staging for letterboxed inputs
+        self.face_host_buffer = torch.empty((FACE_MAX_BATCH, FACE_INPUT_SIZE, FACE_INPUT_SIZE, 3),
+                                            dtype=torch.uint8, pin_memory=True)
+        self.face_staging = torch.empty_like(self.face_host_buffer, device=self.device)
+    
+    def _build_face_engine(self, trt_logger) -> bytes:
+        """Build an FP16 engine from the face detector ONNX with a dynamic batch profile"""
+        builder = trt.Builder(trt_logger)
+        network = builder.create_network(0)
+        parser = trt.OnnxParser(network, trt_logger)
+        with open(FACE_DETECTOR_ONNX, 'rb') as f:
+            if not parser.parse(f.read()):
+                raise RuntimeError(f"Failed to parse face detector: {parser.get_error(0)}")
+        
+        input_shape = (3, FACE_INPUT_SIZE, FACE_INPUT_SIZE)
+        profile = builder.create_optimization_profile()
+        profile.set_shape(network.get_input(0).name, (1, *input_shape),
+                          (FACE_MAX_BATCH, *input_shape), (FACE_MAX_BATCH, *input_shape))
+        config = builder.create_builder_config()
+        config.set_flag(trt.BuilderFlag.FP16)
+        config.add_optimization_profile(profile)
+        
+        return bytes(builder.build_serialized_network(network, config))
+    
+    def gpu_utilization(self) -> float:
+        """GPU utilization percentage from NVML, cached for GPU_UTILIZATION_TTL seconds"""
+        if self._nvml_handle is None:
+            raise RuntimeError("NVML is not initialized")
+        read_time, value = self._gpu_utilization
+        now = time.monotonic()
+        if value is None or now - read_time >= GPU_UTILIZATION_TTL:
+            value = float(pynvml.nvmlDeviceGetUtilizationRates(self._nvml_handle).gpu)
+            self._gpu_utilization = (now, value)
+        return value
+    
     async def connect_redis(self):
         """Connect to Redis queue"""
         self.redis_client = redis.from_url(
-            os.getenv('REDIS_URL', 'redis://localhost:6379')
+            os.getenv('REDIS_URL', 'redis://localhost:6379'),
+            max_connections=32,
+            decode_responses=False
         )
     
+    async def connect_http(self):
+        """Open a pooled HTTP session reused for every webhook call"""
+        self.http_session = await self._exit_stack.enter_async_context(
+            aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        )
+    
+    async def connect_s3(self):
+        """Open a long-lived async S3 client"""
+        self.s3_client = await self._exit_stack.enter_async_context(
+            aioboto3.Session().client('s3')
+        )
+    
+    async def close(self):
+        """Close clients opened at startup"""
+        await self.ocr_batcher.close()
+        await self._exit_stack.aclose()
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+    
+    def detect_faces_batch(self, images: List[np.ndarray]) -> List[list]:
+        """Detect faces with the TensorRT engine.
+        
+        Returns (top, right, bottom, left) locations per image, matching
+        face_recognition.face_locations.
+        """
+        batch_locations = []
+        host = self.face_host_buffer.numpy()
+        
+        for start in range(0, len(images), FACE_MAX_BATCH):
+            chunk = images[start:start + FACE_MAX_BATCH]
+            batch = len(chunk)
+            
+            # Letterbox into the top-left corner of the pinned buffer
+            host[:batch] = 114
+            scales = []
+            for i, image in enumerate(chunk):
+                scale = FACE_INPUT_SIZE / max(image.shape[:2])
+                height, width = round(image.shape[0] * scale), round(image.shape[1] * scale)
+                resized = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+                host[i, :height, :width] = resized
+                scales.append(scale)
+            
+            # H2D copy and normalization into the engine input
+            stream = torch.cuda.current_stream()
+            staged = self.face_staging[:batch]
+            staged.copy_(self.face_host_buffer[:batch], non_blocking=True)
+            self.face_input[:batch].copy_(staged.permute(0, 3, 1, 2)).div_(255)
+            
+            self.face_context.set_input_shape(self.face_input_name, (batch, 3, FACE_INPUT_SIZE, FACE_INPUT_SIZE))
+            self.face_context.execute_async_v3(stream.cuda_stream)
+            
+            # Undo the letterbox scale on GPU, then copy the small results back
+            scale_tensor = torch.tensor(scales, device=self.device).view(-1, 1, 1)
+            boxes = (self.face_outputs['det_boxes'][:batch].float() / scale_tensor).round().int().cpu()
+            num_dets = self.face_outputs['num_dets'][:batch].view(-1).cpu()
+            
+            for i, image in enumerate(chunk):
+                height, width = image.shape[:2]
+                batch_locations.append([
+                    (max(0, y1), min(width, x2), min(height, y2), max(0, x1))
+                    for x1, y1, x2, y2 in boxes[i, :num_dets[i]].tolist()
+                ])
+        
+        return batch_locations
+    
     def detect_and_redact_faces(self, image_array: np.ndarray) -> tuple:
         """Detect and redact faces in image"""
-        face_locations = face_recognition.face_locations(image_array)
+        return self.detect_and_redact_faces_batch([image_array])[0]
+    
+    def detect_and_redact_faces_batch(self, images: List[np.ndarray]) -> List[tuple]:
+        """Detect and redact faces in several images"""
+        if self.face_engine is not None:
+            # The engine context and its buffers are shared, so one batch at a time
+            with self.face_lock, torch.cuda.stream(self.face_stream):
+                batch_locations = self.detect_faces_batch(images)
+        else:
+            batch_locations = [face_recognition.face_locations(image) for image in images]
+        
+        results = []
+        for image_array, face_locations in zip(images, batch_locations):
+            # Images without faces are passed through untouched. Others get a copy
+            # since OCR may still be reading image_array on another thread
+            redacted_image = image_array
+            if face_locations:
+                redacted_image = image_array.copy()
+                
+                # Blur the whole frame once, then copy only the face regions across
+                blurred_image = cv2.GaussianBlur(image_array, (99, 99), 30)
+                for (top, right, bottom, left) in face_locations:
+                    redacted_image[top:bottom, left:right] = blurred_image[top:bottom, left:right]
+            
+            FACES_REDACTED.inc(len(face_locations))
+            results.append((redacted_image, len(face_locations)))
+        
+        return results
+    
+    def encode_jpeg_batch(self, images: List[np.ndarray]) -> List[bytes]:
+        """Encode RGB images as JPEG, on the GPU with nvJPEG when available.
         
-        redacted_image = image_array.copy()
-        for (top, right, bottom, left) in face_locations:
-            # Apply Gaussian blur to face region
-            face_region = redacted_image[top:bottom, left:right]
-            blurred_face = cv2.GaussianBlur(face_region, (99, 99), 30)
-            redacted_image[top:bottom, left:right] = blurred_face
+        The CPU path converts the images to BGR in place for cv2.imencode.
+        """
+        if self.device.type == 'cuda':
+            tensors = [
+                torch.from_numpy(image).to(self.device).permute(2, 0, 1).contiguous()
+                for image in images
+            ]
+            return [buffer.cpu().numpy().tobytes() for buffer in encode_jpeg(tensors, quality=JPEG_QUALITY)]
         
-        FACES_REDACTED.inc(len(face_locations))
-        return redacted_image, len(face_locations)
+        encoded_images = []
+        for image in images:
+            cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=image)
+            _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+            encoded_images.append(buffer.tobytes())
+        return encoded_images
     
-    def extract_and_redact_text(self, image: Image.Image) -> tuple:
+    def extract_and_redact_text(self, image: np.ndarray) -> tuple:
         """Extract text using OCR and redact PII"""
-        # OCR extraction
-        pixel_values = self.ocr_processor(image, return_tensors="pt").pixel_values.to(self.device)
-        generated_ids = self.ocr_model.generate(pixel_values)
-        generated_text = self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-        
-        # NER for PII detection
-        doc = self.nlp(generated_text)
-        pii_entities = []
-        
-        for ent in doc.ents:
-            if ent.label_ in ['PERSON', 'ORG', 'GPE', 'PHONE', 'EMAIL', 'SSN', 'CREDIT_CARD']:
-                pii_entities.append({
-                    'text': ent.text,
-                    'label': ent.label_,
-                    'start': ent.start_char,
-                    'end': ent.end_char
-                })
+        return self.extract_and_redact_text_batch([image])[0]
+    
+    def extract_and_redact_text_batch(self, images: List[np.ndarray]) -> List[tuple]:
+        """Extract text from several images in batched OCR passes and redact PII"""
+        generated_texts = []
+        for start in range(0, len(images), OCR_MAX_BATCH):
+            generated_texts.extend(self._generate_text(images[start:start + OCR_MAX_BATCH]))
+        
+        return self.redact_pii_batch(generated_texts, OCR_PII_LABELS)
+    
+    def _generate_text(self, images: List[np.ndarray]) -> List[str]:
+        """Run one OCR generate call over a batch of at most OCR_MAX_BATCH images"""
+        if self.device.type == 'cuda':
+            # Copy raw uint8 frames from pinned memory on the copy stream, then
+            # preprocess and generate on the OCR stream
+            with torch.cuda.stream(self.copy_stream):
+                frames = [
+                    torch.from_numpy(np.asarray(image)).pin_memory().to(self.device, non_blocking=True)
+                    for image in images
+                ]
+            self.ocr_stream.wait_stream(self.copy_stream)
+            with torch.cuda.stream(self.ocr_stream):
+                for frame in frames:
+                    frame.record_stream(self.ocr_stream)
+                pixel_values = torch.stack([self._preprocess_frame(frame) for frame in frames])
+                with torch.autocast('cuda', dtype=torch.float16):
+                    generated_ids = self.ocr_model.generate(pixel_values, num_beams=1)
+            self.ocr_stream.synchronize()
+        else:
+            # The processor takes the RGB ndarrays directly and preprocesses the whole batch in one call
+            pixel_values = self.ocr_processor(images=images, return_tensors="pt").pixel_values
+            generated_ids = self.ocr_model.generate(pixel_values.to(self.device), num_beams=1)
+        return self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)
+    
+    def _preprocess_frame(self, frame: torch.Tensor) -> torch.Tensor:
+        """GPU equivalent of TrOCRProcessor for one HWC uint8 frame, producing FP16 pixel values"""
+        image_processor = self.ocr_processor.image_processor
+        pixel_values = F.to_dtype(frame.permute(2, 0, 1), torch.float16, scale=True)
+        pixel_values = F.resize(pixel_values, [OCR_IMAGE_SIZE, OCR_IMAGE_SIZE], antialias=True)
+        return F.normalize(pixel_values, mean=image_processor.image_mean, std=image_processor.image_std)
+    
+    def redact_pii_batch(self, texts: List[str], labels: List[str]) -> List[tuple]:
+        """Run NER over several texts in one pipe and redact PII entities"""
+        results = []
+        for text, doc in zip(texts, self.nlp.pipe(texts, batch_size=64)):
+            pii_entities = self._rule_entities(text, labels)
+            
+            for ent in doc.ents:
+                if ent.label_ in labels:
+                    pii_entities.append({
+                        'text': ent.text,
+                        'label': ent.label_,
+                        'start': ent.start_char,
+                        'end': ent.end_char
+                    })
+            
+            pii_entities = self._merge_entities(pii_entities)
+            
+            # Redact PII from text in one left-to-right pass over the sorted spans
+            parts = []
+            position = 0
+            for entity in pii_entities:
+                parts.append(text[position:entity['start']])
+                parts.append('[REDACTED]')
+                position = entity['end']
+            parts.append(text[position:])
+            redacted_text = ''.join(parts)
+            
+            PII_REDACTED.inc(len(pii_entities))
+            results.append((redacted_text, len(pii_entities)))
         
-        # Redact PII from text
-        redacted_text = generated_text
-        for entity in sorted(pii_entities, key=lambda x: x['start'], reverse=True):
-            redacted_text = redacted_text[:entity['start']] + '[REDACTED]' + redacted_text[entity['end']:]
+        return results
+    
+    def _rule_entities(self, text: str, labels: List[str]) -> List[dict]:
+        """Find pattern-based PII (emails, phone numbers, SSNs, card numbers)"""
+        entities = []
+        
+        # Hyperscan offsets are bytes, so it only handles ASCII text
+        if self.pii_database is not None and text.isascii():
+            def on_match(pattern_id, start, end, flags, context):
+                label = self.pii_labels[pattern_id]
+                if label in labels:
+                    entities.append({
+                        'text': text[start:end],
+                        'label': label,
+                        'start': start,
+                        'end': end
+                    })
+            
+            # All patterns in a single pass; every match end is reported and
+            # _merge_entities keeps the longest one
+            scratch = getattr(self._pii_scratch, 'scratch', None)
+            if scratch is None:
+                scratch = self._pii_scratch.scratch = hyperscan.Scratch(self.pii_database)
+            self.pii_database.scan(text.encode(), match_event_handler=on_match, scratch=scratch)
+            return entities
         
-        PII_REDACTED.inc(len(pii_entities))
-        return redacted_text, len(pii_entities)
+        for label, pattern in PII_PATTERNS.items():
+            if label not in labels:
+                continue
+            for match in pattern.finditer(text):
+                entities.append({
+                    'text': match.group(),
+                    'label': label,
+                    'start': match.start(),
+                    'end': match.end()
+                })
+        return entities
+    
+    def _merge_entities(self, entities: List[dict]) -> List[dict]:
+        """Sort entities by start, dropping any that overlap an earlier (or longer) one"""
+        merged = []
+        for entity in sorted(entities, key=lambda x: (x['start'], -x['end'])):
+            if merged and entity['start'] < merged[-1]['end']:
+                continue
+            merged.append(entity)
+        return merged
     
-    def process_audio(self, audio_path: str) -> dict:
+    def process_audio(self, audio: Union[str, BinaryIO]) -> dict:
         """Process audio file with Whisper and redact PII"""
-        result = self.whisper_model.transcribe(audio_path)
-        transcript = result["text"]
+        return self.process_audio_batch([audio])[0]
+    
+    def process_audio_batch(self, audios: List[Union[str, BinaryIO]]) -> List[dict]:
+        """Transcribe several audio files and redact PII in one NER pass.
         
-        # Apply NER to transcript
-        doc = self.nlp(transcript)
-        pii_count = 0
-        redacted_transcript = transcript
+        Each entry is a path or an in-memory file object, which faster-whisper
+        decodes and resamples with PyAV without touching disk.
+        """
+        transcripts = []
+        for audio in audios:
+            segments, _ = self.whisper_model.transcribe(
+                audio, beam_size=1, vad_filter=True, batch_size=WHISPER_BATCH_SIZE
+            )
+            transcripts.append(''.join(segment.text for segment in segments))
         
-        for ent in reversed(doc.ents):
-            if ent.label_ in ['PERSON', 'ORG', 'GPE', 'PHONE', 'EMAIL']:
-                redacted_transcript = redacted_transcript[:ent.start_char] + '[REDACTED]' + redacted_transcript[ent.end_char:]
-                pii_count += 1
+        results = []
+        for transcript, (redacted_transcript, pii_count) in zip(
+            transcripts, self.redact_pii_batch(transcripts, AUDIO_PII_LABELS)
+        ):
+            results.append({
+                'original_transcript': transcript,
+                'redacted_transcript': redacted_transcript,
+                'pii_entities_found': pii_count
+            })
         
-        PII_REDACTED.inc(pii_count)
-        return {
-            'original_transcript': transcript,
-            'redacted_transcript': redacted_transcript,
-            'pii_entities_found': pii_count
-        }
+        return results
     
     async def process_report(self, job_data: dict) -> dict:
         """Main processing function for a report"""
-        report_id = job_data['reportId']
-        logger.info(f"Processing report {report_id}")
+        return (await self.process_report_batch([job_data]))[0]
+    
+    async def process_report_batch(self, jobs: List[dict]) -> List[dict]:
+        """Process several reports together.
+        
+        The files of all reports are flattened into one batch for the models,
+        then the file results are split back into per-report summaries.
+        """
+        logger.info(f"Processing {len(jobs)} reports")
+        start_time = time.perf_counter()
         
-        with PROCESSING_TIME.time():
+        results = []
+        files = []
+        encryption_keys = []
+        owners = []  # index into results for each file
+        for job_data in jobs:
+            # A malformed job fails on its own without affecting the rest of the batch
+            report_id = job_data.get('reportId') if isinstance(job_data, dict) else None
             try:
-                results = {
-                    'reportId': report_id,
-                    'status': 'processing',
-                    'redactionSummary': {
-                        'facesRedacted': 0,
-                        'piiRedacted': 0,
-                        'filesProcessed': 0
-                    },
-                    'processedFiles': []
-                }
-                
-                # Process each file
-                for file_info in job_data.get('files', []):
-                    file_result = await self.process_file(file_info, job_data['wrappedKey'])
-                    results['processedFiles'].append(file_result)
-                    results['redactionSummary']['facesRedacted'] += file_result.get('facesRedacted', 0)
-                    results['redactionSummary']['piiRedacted'] += file_result.get('piiRedacted', 0)
-                    results['redactionSummary']['filesProcessed'] += 1
-                
-                results['status'] = 'completed'
-                PROCESSED_REPORTS.inc()
-                
-                return results
-                
+                report_id = job_data['reportId']
+                job_files = job_data.get('files', [])
+                if not isinstance(job_files, list):
+                    raise ValueError("'files' must be a list")
+                encryption_key = job_data['wrappedKey']
             except Exception as e:
-                logger.error(f"Processing failed for report {report_id}: {str(e)}")
-                return {
-                    'reportId': report_id,
-                    'status': 'failed',
-                    'error': str(e)
-                }
-    
-    async def process_file(self, file_info: dict, encryption_key: str) -> dict:
-        """Process individual file"""
-        file_key = file_info['key']
-        original_name = file_info['originalName']
-        
-        # Download encrypted file from S3
-        response = self.s3_client.get_object(
-            Bucket=os.getenv('S3_BUCKET', 'incident-reports-encrypted'),
-            Key=file_key
-        )
-        encrypted_content = response['Body'].read()
-        
-        # Decrypt file (simplified - use proper decryption in production)
-        # decrypted_content = decrypt_file_content(encrypted_content, encryption_key)
-        
-        file_extension = original_name.lower().split('.')[-1]
-        result = {
-            'originalName': original_name,
-            'fileKey': file_key,
-            'facesRedacted': 0,
-            'piiRedacted': 0,
-            'processed': True
-        }
+                results.append(self._failed_report(report_id, e))
+                continue
+            
+            files.extend(job_files)
+            encryption_keys.extend([encryption_key] * len(job_files))
+            owners.extend([len(results)] * len(job_files))
+            results.append({
+                'reportId': report_id,
+                'status': 'processing',
+                'redactionSummary': {
+                    'facesRedacted': 0,
+                    'piiRedacted': 0,
+                    'filesProcessed': 0
+                },
+                'processedFiles': []
+            })
         
+        # Process all files of all reports as one batch
         try:
-            if file_extension in ['jpg', 'jpeg', 'png', 'gif']:
-                # Process image
-                image_array = np.frombuffer(encrypted_content, np.uint8)
-                image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-                
-                # Face redaction
-                redacted_image, faces_count = self.detect_and_redact_faces(image)
-                result['facesRedacted'] = faces_count
+            file_results = await self.process_files(files, encryption_keys)
+        except Exception as e:
+            return [
+                self._failed_report(result['reportId'], e) if result['status'] == 'processing' else result
+                for result in results
+            ]
+        
+        for owner, file_result in zip(owners, file_results):
+            report = results[owner]
+            if report['status'] != 'processing':
+                continue
+            # A file that was never downloaded was never redacted, so its report fails
+            if isinstance(file_result, Exception):
+                results[owner] = self._failed_report(report['reportId'], file_result)
+                continue
+            report['processedFiles'].append(file_result)
+            report['redactionSummary']['facesRedacted'] += file_result.get('facesRedacted', 0)
+            report['redactionSummary']['piiRedacted'] += file_result.get('piiRedacted', 0)
+            report['redactionSummary']['filesProcessed'] += 1
+        
+        for report in results:
+            if report['status'] == 'processing':
+                report['status'] = 'completed'
+                PROCESSED_REPORTS.inc()
+        BATCH_PROCESSING_TIME.observe(time.perf_counter() - start_time)
+        
+        return results
+    
+    def _failed_report(self, report_id: str, error: Exception) -> dict:
+        """Build the result for a report that could not be processed"""
+        logger.error(f"Processing failed for report {report_id}: {str(error)}")
+        return {
+            'reportId': report_id,
+            'status': 'failed',
+            'error': str(error)
+        }
+    
+    async def process_files(self, files: List[dict], encryption_keys: List[str]) -> List[dict]:
+        """Process a batch of files in two phases.
+        
+        Phase 1 downloads every file concurrently and decodes it, phase 2 runs
+        the models over all images and all audio files in batches while the
+        redacted images upload in the background. Results are returned in the
+        same order as ``files``; a file that could not be downloaded is returned
+        as its exception.
+        """
+        results = []
+        images = []  # (result index, decoded image)
+        audio_files = []  # (result index, in-memory audio)
+        
+        # Phase 1: download + decode
+        downloads = await asyncio.gather(
+            *(self._download_file(file_info) for file_info in files),
+            return_exceptions=True
+        )
+        for file_info, encryption_key, encrypted_content in zip(files, encryption_keys, downloads):
+            # Malformed entries surface as a failed download below
+            if not isinstance(file_info, dict):
+                file_info = {}
+            file_key = file_info.get('key')
+            original_name = file_info.get('originalName')
+            if isinstance(encrypted_content, Exception):
+                logger.error(f"Download failed for {original_name}: {str(encrypted_content)}")
+                results.append(encrypted_content)
+                continue
+            
+            result = {
+                'originalName': original_name,
+                'fileKey': file_key,
+                'facesRedacted': 0,
+                'piiRedacted': 0,
+                'processed': True
+            }
+            results.append(result)
+            
+            try:
+                # Decrypt file (simplified - use proper decryption in production)
+                # decrypted_content = decrypt_file_content(encrypted_content, encryption_key)
                 
-                # OCR and PII redaction
-                pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-                _, pii_count = self.extract_and_redact_text(pil_image)
-                result['piiRedacted'] = pii_count
+                file_extension = original_name.lower().split('.')[-1]
+                if file_extension in ['jpg', 'jpeg', 'png', 'gif']:
+                    # Decode once and convert to RGB in place; faces and OCR share this buffer
+                    image_array = np.frombuffer(encrypted_content, np.uint8)
+                    image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+                    cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+                    images.append((len(results) - 1, image))
+                    
+                elif file_extension in ['mp3', 'wav', 'mp4']:
+                    audio_files.append((len(results) - 1, io.BytesIO(encrypted_content)))
+                    
+            except Exception as e:
+                self._mark_failed(result, e)
+        
+        # Phase 2: batched inference
+        uploads = []  # (result index, redacted key, upload task)
+        if images:
+            try:
+                image_arrays = [image for _, image in images]
                 
-                # Save redacted image back to S3
-                redacted_key = f"redacted/{file_key}"
-                _, buffer = cv2.imencode('.jpg', redacted_image)
-                self.s3_client.put_object(
-                    Bucket=os.getenv('S3_BUCKET', 'incident-reports-encrypted'),
-                    Key=redacted_key,
-                    Body=buffer.tobytes(),
-                    ServerSideEncryption='AES256'
+                # Face redaction and OCR + PII redaction share no tensors, so run them
+                # concurrently on their own threads and CUDA streams. OCR goes through
+                # the micro-batcher so images from concurrent reports are coalesced
+                redacted_images, text_results = await asyncio.gather(
+                    run_in_thread(self.detect_and_redact_faces_batch, image_arrays),
+                    self.ocr_batcher.submit(image_arrays)
                 )
-                result['redactedKey'] = redacted_key
-                
-            elif file_extension in ['mp3', 'wav', 'mp4']:
-                # Process audio/video
-                temp_file = f"/tmp/{original_name}"
-                with open(temp_file, 'wb') as f:
-                    f.write(encrypted_content)
                 
-                audio_result = self.process_audio(temp_file)
-                result['piiRedacted'] = audio_result['pii_entities_found']
-                result['transcript'] = audio_result['redacted_transcript']
+                for (index, _), (_, faces_count), (_, pii_count) in zip(
+                    images, redacted_images, text_results
+                ):
+                    results[index]['facesRedacted'] = faces_count
+                    results[index]['piiRedacted'] = pii_count
                 
-                os.remove(temp_file)
+                # Save redacted images back to S3
+                encoded_images = await run_in_thread(
+                    self.encode_jpeg_batch, [image for image, _ in redacted_images]
+                )
+                for (index, _), encoded_image in zip(images, encoded_images):
+                    redacted_key = f"redacted/{results[index]['fileKey']}"
+                    upload = asyncio.ensure_future(self._upload(redacted_key, encoded_image))
+                    uploads.append((index, redacted_key, upload))
                 
-        except Exception as e:
-            logger.error(f"File processing error for {original_name}: {str(e)}")
-            result['processed'] = False
-            result['error'] = str(e)
+            except Exception as e:
+                for index, _ in images:
+                    self._mark_failed(results[index], e)
+        
+        if audio_files:
+            try:
+                audio_results = await run_in_thread(
+                    self.process_audio_batch, [audio for _, audio in audio_files]
+                )
+                for (index, _), audio_result in zip(audio_files, audio_results):
+                    results[index]['piiRedacted'] = audio_result['pii_entities_found']
+                    results[index]['transcript'] = audio_result['redacted_transcript']
+                    
+            except Exception as e:
+                for index, _ in audio_files:
+                    self._mark_failed(results[index], e)
         
-        return result
+        # Wait for the redacted images uploaded during audio processing
+        upload_results = await asyncio.gather(*(upload for _, _, upload in uploads), return_exceptions=True)
+        for (index, redacted_key, _), upload_result in zip(uploads, upload_results):
+            if isinstance(upload_result, Exception):
+                self._mark_failed(results[index], upload_result)
+            else:
+                results[index]['redactedKey'] = redacted_key
+        
+        return results
+    
+    async def _download_file(self, file_info: dict) -> bytes:
+        """Validate a file entry of a job and download its content"""
+        if not isinstance(file_info.get('key'), str) or not isinstance(file_info.get('originalName'), str):
+            raise ValueError("File entry needs string 'key' and 'originalName' fields")
+        return await self._download(file_info['key'])
+    
+    async def _download(self, key: str) -> bytes:
+        """Download an object from the reports bucket"""
+        response = await self.s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+        async with response['Body'] as stream:
+            return await stream.read()
+    
+    async def _upload(self, key: str, body: bytes):
+        """Upload an object to the reports bucket with server-side encryption"""
+        await self.s3_client.upload_fileobj(
+            io.BytesIO(body), S3_BUCKET, key,
+            ExtraArgs={'ServerSideEncryption': 'AES256'},
+            Config=S3_TRANSFER_CONFIG
+        )
+    
+    def _mark_failed(self, result: dict, error: Exception):
+        """Record a per-file processing error on its result"""
+        logger.error(f"File processing error for {result['originalName']}: {str(error)}")
+        result['processed'] = False
+        result['error'] = str(error)
 
 # Initialize worker
 worker = GPURedactionWorker()
@@ -247,25 +981,66 @@ worker = GPURedactionWorker()
 @app.on_event("startup")
 async def startup_event():
     await worker.connect_redis()
+    await worker.connect_s3()
+    await worker.connect_http()
     # Start background job processor
     asyncio.create_task(job_processor())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await worker.close()
+
+async def next_job_batch() -> List[dict]:
+    """Wait for a job, then coalesce up to JOB_MAX_BATCH queued jobs.
+    
+    Whatever is already queued is taken at once, so the batch grows with the
+    queue depth; if there is room left, producers get one short window to add
+    more. Jobs are popped from the right to keep the gateway's LPUSH order.
+    """
+    job_data = await worker.redis_client.brpop(JOB_QUEUE, timeout=10)
+    if not job_data:
+        return []
+    
+    payloads = [job_data[1]]
+    for wait in (0, JOB_BATCH_WINDOW):
+        if len(payloads) >= JOB_MAX_BATCH:
+            break
+        await asyncio.sleep(wait)
+        payloads.extend(await worker.redis_client.rpop(JOB_QUEUE, JOB_MAX_BATCH - len(payloads)) or [])
+    
+    # Drop undecodable payloads one by one so they don't take the batch with them
+    jobs = []
+    for payload in payloads:
+        try:
+            job = json.loads(payload)
+            if not isinstance(job, dict):
+                raise ValueError("job payload is not a JSON object")
+            jobs.append(job)
+        except ValueError as e:
+            logger.error(f"Dropping malformed job {payload[:200]!r}: {str(e)}")
+    return jobs
+
+async def send_results(results: List[dict]):
+    """POST each report result to the gateway webhook independently"""
+    webhook_url = os.getenv('GATEWAY_WEBHOOK_URL', 'http://localhost:8000/api/webhook/processing-complete')
+    for result in results:
+        try:
+            async with worker.http_session.post(webhook_url, json=result):
+                pass
+        except Exception as e:
+            logger.error(f"Webhook failed for report {result.get('reportId')}: {str(e)}")
+
 async def job_processor():
     """Background task to process jobs from Redis queue"""
     while True:
         try:
-            # Pop job from queue
-            job_data = await worker.redis_client.brpop('gpu-worker-queue', timeout=10)
+            jobs = await next_job_batch()
             
-            if job_data:
-                job_json = json.loads(job_data[1])
-                result = await worker.process_report(job_json)
+            if jobs:
+                results = await worker.process_report_batch(jobs)
                 
-                # Send result back to gateway API
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    webhook_url = os.getenv('GATEWAY_WEBHOOK_URL', 'http://localhost:8000/api/webhook/processing-complete')
-                    await session.post(webhook_url, json=result)
+                # Send results back to gateway API
+                await send_results(results)
                 
         except Exception as e:
             logger.error(f"Job processor error: {str(e)}")
@@ -286,13 +1061,10 @@ async def health_check():
         
         # Update GPU utilization metric
         try:
-            nvidia_smi = subprocess.run(['nvidia-smi', '--query-gpu=utilization.gpu', '--format=csv,noheader,nounits'], 
-                                      capture_output=True, text=True)
-            if nvidia_smi.returncode == 0:
-                gpu_util = float(nvidia_smi.stdout.strip())
-                GPU_UTILIZATION.set(gpu_util)
-                gpu_info['gpu_utilization'] = gpu_util
-        except:
+            gpu_util = worker.gpu_utilization()
+            GPU_UTILIZATION.set(gpu_util)
+            gpu_info['gpu_utilization'] = gpu_util
+        except Exception:
             pass
     
     return {
@@ -1,8 +1,11 @@
 import pytest
 import asyncio
+import contextvars
 import json
-from unittest.mock import Mock, patch
-from main import GPURedactionWorker
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+import main
+from main import GPURedactionWorker, MicroBatcher, OCR_PII_LABELS, run_in_thread
 import numpy as np
 from PIL import Image
 
@@ -41,6 +44,32 @@ class TestGPURedactionWorker:
         assert hasattr(worker, 'whisper_model')
         assert hasattr(worker, 'nlp')
     
+    def test_worker_initialization_without_nvml(self):
+        """Test that a missing NVML library does not stop the worker from starting"""
+        # Pretend to be a CUDA host without touching a driver
+        with patch.object(main.torch.cuda, 'is_available', return_value=True), \
+                patch.object(main.torch.cuda, 'Stream'), \
+                patch.object(GPURedactionWorker, 'load_models'), \
+                patch.object(main.pynvml, 'nvmlInit', side_effect=main.pynvml.NVMLError(main.pynvml.NVML_ERROR_LIBRARY_NOT_FOUND)):
+            worker = GPURedactionWorker()
+        
+        assert worker._nvml_handle is None
+        with pytest.raises(RuntimeError):
+            worker.gpu_utilization()
+    
+    def test_cached_engine_metadata(self, worker, tmp_path):
+        """Test that a cached engine is only reused when its build metadata matches"""
+        engine_path = str(tmp_path / 'engine.ts')
+        metadata = {'min_batch': 1, 'max_batch': 16, 'gpu': 'test'}
+        
+        assert not worker._cached_engine_matches(engine_path, metadata)
+        
+        open(engine_path, 'wb').close()
+        worker._save_engine_metadata(engine_path, metadata)
+        
+        assert worker._cached_engine_matches(engine_path, metadata)
+        assert not worker._cached_engine_matches(engine_path, dict(metadata, max_batch=32))
+    
     def test_face_detection(self, worker, sample_image):
         """Test face detection and redaction"""
         with patch('face_recognition.face_locations') as mock_face_locations:
@@ -52,6 +81,16 @@ class TestGPURedactionWorker:
             assert redacted_image.shape == sample_image.shape
             mock_face_locations.assert_called_once()
     
+    def test_face_redaction_without_faces(self, worker, sample_image):
+        """Test that images without faces are returned without a copy"""
+        with patch('face_recognition.face_locations') as mock_face_locations:
+            mock_face_locations.return_value = []
+            
+            redacted_image, face_count = worker.detect_and_redact_faces(sample_image)
+            
+            assert face_count == 0
+            assert redacted_image is sample_image
+    
     def test_text_extraction(self, worker):
         """Test OCR text extraction and PII redaction"""
         # Create a simple test image
@@ -70,13 +109,42 @@ class TestGPURedactionWorker:
             mock_generate.assert_called_once()
             mock_decode.assert_called_once()
     
-    @patch('whisper.load_model')
-    def test_audio_processing(self, mock_whisper, worker):
+    def test_batched_text_extraction(self, worker):
+        """Test that a batch of images runs through a single OCR generate call"""
+        test_images = [Image.new('RGB', (200, 100), color='white') for _ in range(3)]
+        
+        with patch.object(worker.ocr_model, 'generate') as mock_generate, \
+             patch.object(worker.ocr_processor, 'batch_decode') as mock_decode:
+            
+            mock_generate.return_value = [[1, 2, 3]] * 3
+            mock_decode.return_value = ['first', 'second', 'third']
+            
+            results = worker.extract_and_redact_text_batch(test_images)
+            
+            assert len(results) == 3
+            assert [text for text, _ in results] == ['first', 'second', 'third']
+            mock_generate.assert_called_once()
+            assert mock_generate.call_args[0][0].shape[0] == 3
+    
+    def test_rule_based_pii_redaction(self, worker):
+        """Test that pattern-based PII is redacted even though NER never labels it"""
+        text = 'Contact jane@example.com or 555-123-4567, SSN 123-45-6789'
+        
+        [(redacted_text, pii_count)] = worker.redact_pii_batch([text], OCR_PII_LABELS)
+        
+        assert 'jane@example.com' not in redacted_text
+        assert '555-123-4567' not in redacted_text
+        assert '123-45-6789' not in redacted_text
+        assert pii_count >= 3
+        assert ' or [REDACTED], ' in redacted_text
+    
+    def test_audio_processing(self, worker):
         """Test audio transcription and PII redaction"""
         mock_model = Mock()
-        mock_model.transcribe.return_value = {
-            'text': 'Hello, my name is John Doe and my phone is 555-1234'
-        }
+        mock_model.transcribe.return_value = (
+            [Mock(text=' Hello, my name is John Doe'), Mock(text=' and my phone is 555-1234')],
+            Mock()
+        )
         worker.whisper_model = mock_model
         
         result = worker.process_audio('/tmp/test.mp3')
@@ -85,18 +153,19 @@ class TestGPURedactionWorker:
         assert 'redacted_transcript' in result
         assert 'pii_entities_found' in result
         assert result['pii_entities_found'] >= 0
+        assert result['original_transcript'] == ' Hello, my name is John Doe and my phone is 555-1234'
     
     @pytest.mark.asyncio
     async def test_process_report(self, worker, sample_job_data):
         """Test complete report processing"""
-        with patch.object(worker, 'process_file') as mock_process_file:
-            mock_process_file.return_value = {
+        with patch.object(worker, 'process_files') as mock_process_files:
+            mock_process_files.return_value = [{
                 'originalName': 'test-image.jpg',
                 'fileKey': 'test-file.jpg',
                 'facesRedacted': 2,
                 'piiRedacted': 3,
                 'processed': True
-            }
+            }]
             
             result = await worker.process_report(sample_job_data)
             
@@ -106,6 +175,147 @@ class TestGPURedactionWorker:
             assert result['redactionSummary']['facesRedacted'] == 2
             assert result['redactionSummary']['piiRedacted'] == 3
             assert result['redactionSummary']['filesProcessed'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_process_report_batch(self, worker, sample_job_data):
+        """Test that files of several reports are processed together and split back"""
+        second_job = dict(sample_job_data, reportId='test-report-456', files=[
+            {'key': 'a.jpg', 'originalName': 'a.jpg'},
+            {'key': 'b.mp3', 'originalName': 'b.mp3'}
+        ])
+        
+        with patch.object(worker, 'process_files') as mock_process_files:
+            mock_process_files.return_value = [
+                {'originalName': 'test-image.jpg', 'facesRedacted': 1, 'piiRedacted': 0, 'processed': True},
+                {'originalName': 'a.jpg', 'facesRedacted': 2, 'piiRedacted': 1, 'processed': True},
+                {'originalName': 'b.mp3', 'facesRedacted': 0, 'piiRedacted': 4, 'processed': True}
+            ]
+            
+            results = await worker.process_report_batch([sample_job_data, second_job])
+            
+            mock_process_files.assert_called_once()
+            assert len(mock_process_files.call_args[0][0]) == 3
+            assert [r['reportId'] for r in results] == ['test-report-123', 'test-report-456']
+            assert results[0]['redactionSummary']['filesProcessed'] == 1
+            assert results[1]['redactionSummary']['facesRedacted'] == 2
+            assert results[1]['redactionSummary']['piiRedacted'] == 5
+    
+    @pytest.mark.asyncio
+    async def test_process_report_batch_isolates_malformed_jobs(self, worker, sample_job_data):
+        """Test that a malformed job or file only fails itself"""
+        jobs = [
+            dict(sample_job_data, files=[]),
+            {'wrappedKey': 'test-key', 'files': []},
+            dict(sample_job_data, reportId='test-report-456', files=[{'originalName': 'no-key.jpg'}])
+        ]
+        
+        with patch.object(worker, '_download') as mock_download:
+            results = await worker.process_report_batch(jobs)
+            
+            mock_download.assert_not_called()
+        
+        assert [r['status'] for r in results] == ['completed', 'failed', 'failed']
+        assert 'originalName' in results[2]['error']
+    
+    @pytest.mark.asyncio
+    async def test_process_report_batch_fails_report_on_download_error(self, worker, sample_job_data):
+        """Test that a report whose file could not be downloaded is not reported as completed"""
+        second_job = dict(sample_job_data, reportId='test-report-456', files=[
+            {'key': 'a.mp3', 'originalName': 'a.mp3'}
+        ])
+        
+        async def download(key):
+            if key == 'test-file.jpg':
+                raise ConnectionError("S3 unavailable")
+            return b'audio'
+        
+        with patch.object(worker, '_download', side_effect=download), \
+                patch.object(worker, 'process_audio_batch', return_value=[
+                    {'pii_entities_found': 0, 'redacted_transcript': ''}
+                ]):
+            results = await worker.process_report_batch([sample_job_data, second_job])
+        
+        assert results[0]['status'] == 'failed'
+        assert results[0]['error'] == 'S3 unavailable'
+        assert results[1]['status'] == 'completed'
+        assert results[1]['redactionSummary']['filesProcessed'] == 1
+
+class TestJobQueue:
+    
+    @pytest.mark.asyncio
+    async def test_next_job_batch_coalesces_and_drops_malformed_jobs(self):
+        """Test that queued jobs are coalesced and malformed payloads are skipped"""
+        redis_client = AsyncMock()
+        redis_client.brpop.return_value = (b'gpu-worker-queue', b'{"reportId": "a"}')
+        redis_client.rpop.side_effect = [[b'not json', b'{"reportId": "b"}'], None]
+        
+        with patch.object(main.worker, 'redis_client', redis_client):
+            jobs = await main.next_job_batch()
+        
+        assert jobs == [{'reportId': 'a'}, {'reportId': 'b'}]
+        assert redis_client.rpop.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_next_job_batch_without_jobs(self):
+        """Test that an idle queue yields an empty batch"""
+        redis_client = AsyncMock()
+        redis_client.brpop.return_value = None
+        
+        with patch.object(main.worker, 'redis_client', redis_client):
+            assert await main.next_job_batch() == []
+        
+        redis_client.rpop.assert_not_called()
+
+class TestRunInThread:
+    
+    @pytest.mark.asyncio
+    async def test_executor_call_sees_caller_context(self):
+        """Test that context variables (e.g. thinc's GPU ops) reach the worker thread"""
+        marker = contextvars.ContextVar('marker', default=None)
+        marker.set('gpu')
+        
+        assert await run_in_thread(marker.get) == 'gpu'
+
+class TestMicroBatcher:
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_submissions_share_a_batch(self):
+        """Test that items submitted together run through one batch call"""
+        batch_fn = Mock(side_effect=lambda items: [item * 2 for item in items])
+        batcher = MicroBatcher(batch_fn, max_batch=16, max_delay=0.05)
+        
+        first, second = await asyncio.gather(batcher.submit([1, 2]), batcher.submit([3]))
+        await batcher.close()
+        
+        assert first == [2, 4]
+        assert second == [6]
+        batch_fn.assert_called_once_with([1, 2, 3])
+    
+    @pytest.mark.asyncio
+    async def test_close_fails_pending_submissions(self):
+        """Test that closing resolves in-flight and queued items instead of hanging"""
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+        release = threading.Event()
+        
+        def batch_fn(items):
+            loop.call_soon_threadsafe(started.set)
+            release.wait(1)
+            return items
+        
+        batcher = MicroBatcher(batch_fn, max_batch=1, max_delay=0)
+        in_flight = asyncio.ensure_future(batcher.submit([1]))
+        queued = asyncio.ensure_future(batcher.submit([2]))
+        await asyncio.wait_for(started.wait(), 1)
+        
+        await batcher.close()
+        release.set()
+        
+        for submission in (in_flight, queued):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(submission, 1)
+        with pytest.raises(RuntimeError):
+            await batcher.submit([3])
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file